@@ -1,88 +1,200 @@
 import threading
+import concurrent.futures
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import os
-from typing import Dict
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+
+# Поля ресурса, которые запрашиваются у API при получении метаданных файлов
+RESOURCE_FIELDS = "name,path,type,size,md5,sha256,modified,revision"
+
+# Поля страницы листинга: только то, что нужно для сравнения файлов, без превью и прочих метаданных
+LISTING_FIELDS = ",".join(
+    ["_embedded.total"] + [f"_embedded.items.{field}" for field in ("name", "type", "size", "md5", "sha256", "modified", "revision")]
+)
+
+# Количество элементов на одной странице листинга папки
+LISTING_PAGE_LIMIT = 1000
+
+
+class RemoteFileInfo(NamedTuple):
+    """
+    Метаданные файла на Яндекс.Диске.
+
+    Поля:
+    - size (int): Размер файла в байтах.
+    - md5 (Optional[str]): MD5-хеш содержимого файла.
+    - sha256 (Optional[str]): SHA256-хеш содержимого файла.
+    - modified (Optional[str]): Дата последнего изменения в формате ISO 8601.
+    - revision (Optional[int]): Ревизия ресурса.
+    """
+    size: int
+    md5: Optional[str] = None
+    sha256: Optional[str] = None
+    modified: Optional[str] = None
+    revision: Optional[int] = None
+
+    @classmethod
+    def from_resource(cls, item: Dict[str, Any]) -> "RemoteFileInfo":
+        """
+        Создает описание файла из ресурса, который вернул API Яндекс.Диска.
+
+        :param item: Словарь с полями ресурса.
+        :return: Метаданные файла.
+        """
+        return cls(
+            size=item.get("size", 0),
+            md5=item.get("md5"),
+            sha256=item.get("sha256"),
+            modified=item.get("modified"),
+            revision=item.get("revision"),
+        )
 
 
 class YandexDiskUploader:
-    def __init__(self, token: str, cloud_folder: str, local_folder: str) -> None:
+    def __init__(self, token: str, cloud_folder: str, local_folder: str, listing_workers: int = 8) -> None:
         """
         Инициализирует загрузчик для работы с Яндекс.Диском.
 
         :param token: OAuth-токен для доступа к Яндекс.Диску.
         :param cloud_folder: Путь к папке в облаке для хранения резервных копий.
         :param local_folder: Путь к локальной папке для синхронизации.
+        :param listing_workers: Количество потоков для параллельного получения листинга облачной папки.
         """
         self.token = token
         self.cloud_folder = cloud_folder
         self.local_folder = local_folder
+        self.listing_workers = listing_workers
         self.headers = {"Authorization": f"OAuth {self.token}"}
-        
+
         # Настройка сессии с повторными попытками при ошибках подключения
         self.session = requests.Session()
         retries = Retry(total=5, backoff_factor=1, status_forcelist=[502, 503, 504])
         self.session.mount("https://", HTTPAdapter(max_retries=retries))
 
-        # Блокировка для исключения конфликта при создании папок
-        self.folder_lock = threading.Lock()
+        # Кэш папок, которые точно существуют в облаке, и блокировки создания отдельных папок
+        self._known_dirs: Set[str] = set()
+        self._dir_locks: Dict[str, threading.Lock] = {}
+        self._dirs_lock = threading.Lock()
 
 
-    def get_info(self) -> Dict[str, str]:
+    def get_info(self) -> Dict[str, RemoteFileInfo]:
         """
-        Получает информацию о файлах, хранящихся в облаке.
+        Получает информацию о файлах, хранящихся в облаке, включая вложенные папки.
 
-        :return: Словарь с именами файлов в облаке и временем их последнего изменения.
+        :return: Словарь с относительными путями файлов в облаке и их метаданными (размер, хеши, время изменения, ревизия).
         """
-        url = f"https://cloud-api.yandex.net/v1/disk/resources?path={self.cloud_folder}"
         try:
-            response = self.session.get(url, headers=self.headers)
-            response.raise_for_status()
-            items = response.json().get('_embedded', {}).get('items', [])
-            return {item['name']: item['modified'] for item in items}
+            return dict(self.iter_files())
         except requests.RequestException as e:
             print(f"Ошибка при подключении к Яндекс.Диску: {e}")
             return {}
 
+    def iter_files(self) -> Iterator[Tuple[str, RemoteFileInfo]]:
+        """
+        Рекурсивно обходит облачную папку и по мере получения страниц листинга возвращает файлы.
+
+        Все страницы каждой папки запрашиваются параллельно, как только известно общее число элементов,
+        а вложенные папки обходятся параллельно в пуле потоков. В памяти одновременно находятся только
+        страницы, которые еще обрабатываются, поэтому весь листинг не собирается в один JSON или словарь.
 
-    def load(self, path: str) -> None:
+        :return: Генератор пар (относительный путь файла с разделителем "/", метаданные файла).
+        :raises requests.RequestException: Если страницу листинга не удалось получить.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.listing_workers) as executor:
+            pending = {executor.submit(self._list_page, "", 0)}
+            found_dirs = []
+            try:
+                while pending:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        relative_dir, offset, items, total = future.result()
+                        if not relative_dir and total:
+                            found_dirs.append(self.cloud_folder)
+
+                        # После первой страницы известно общее число элементов: запрашиваем остальные страницы сразу
+                        if offset == 0:
+                            for next_offset in range(LISTING_PAGE_LIMIT, total, LISTING_PAGE_LIMIT):
+                                pending.add(executor.submit(self._list_page, relative_dir, next_offset))
+
+                        for item in items:
+                            relative_path = f"{relative_dir}/{item['name']}" if relative_dir else item['name']
+                            if item.get('type') == 'dir':
+                                found_dirs.append(f"{self.cloud_folder}/{relative_path}")
+                                pending.add(executor.submit(self._list_page, relative_path, 0))
+                            else:
+                                yield relative_path, RemoteFileInfo.from_resource(item)
+            finally:
+                # Если генератор закрыт досрочно или произошла ошибка, не ждем оставшиеся страницы
+                for future in pending:
+                    future.cancel()
+                # Найденные папки точно существуют: загрузкам не нужно их проверять или создавать
+                with self._dirs_lock:
+                    self._known_dirs.update(found_dirs)
+
+    def _list_page(self, relative_dir: str, offset: int) -> Tuple[str, int, List[Dict[str, Any]], int]:
+        """
+        Получает одну страницу листинга облачной папки.
+
+        :param relative_dir: Путь к папке относительно облачной папки синхронизации ("" — корень).
+        :param offset: Смещение первого элемента страницы.
+        :return: Кортеж (relative_dir, offset, элементы страницы, общее число элементов в папке).
+        """
+        path = f"{self.cloud_folder}/{relative_dir}" if relative_dir else self.cloud_folder
+        params = {"path": path, "limit": LISTING_PAGE_LIMIT, "offset": offset, "fields": LISTING_FIELDS}
+        response = self.session.get("https://cloud-api.yandex.net/v1/disk/resources", params=params, headers=self.headers)
+        if response.status_code == 404 and not relative_dir:
+            return relative_dir, offset, [], 0  # Облачная папка еще не создана
+        response.raise_for_status()
+        embedded = response.json().get('_embedded', {})
+        return relative_dir, offset, embedded.get('items', []), embedded.get('total', 0)
+
+
+    def load(self, path: str) -> Optional[RemoteFileInfo]:
         """
         Загружает новый файл в облако.
 
         :param path: Путь к файлу, который нужно загрузить.
+        :return: Метаданные загруженного файла или None, если загрузка не выполнена.
         """
-        self._upload_file(path, overwrite=False)
+        return self._upload_file(path, overwrite=False)
 
-    def reload(self, path: str) -> None:
+    def reload(self, path: str) -> Optional[RemoteFileInfo]:
         """
         Перезаписывает существующий файл в облаке.
 
         :param path: Путь к файлу, который нужно перезаписать.
+        :return: Метаданные загруженного файла или None, если загрузка не выполнена.
         """
-        self._upload_file(path, overwrite=True)
+        return self._upload_file(path, overwrite=True)
 
 
-    def delete(self, filename: str) -> None:
+    def delete(self, filename: str) -> bool:
         """
         Удаляет файл из облака.
 
         :param filename: Имя файла для удаления.
+        :return: True, если файл удален.
         """
         url = f"https://cloud-api.yandex.net/v1/disk/resources?path={self.cloud_folder}/{filename}"
         try:
             response = self.session.delete(url, headers=self.headers)
             response.raise_for_status()
+            return True
         except requests.RequestException as e:
             print(f"Ошибка при удалении файла {filename} из облака: {e}")
+            return False
 
 
-    def _upload_file(self, path: str, overwrite: bool) -> None:
+    def _upload_file(self, path: str, overwrite: bool) -> Optional[RemoteFileInfo]:
         """
         Загружает файл в облако. Создает все вложенные папки, если они отсутствуют.
 
         :param path: Путь к файлу, который нужно загрузить.
         :param overwrite: Флаг, указывающий, нужно ли перезаписывать файл, если он уже существует.
+        :return: Метаданные загруженного файла или None, если загрузка не выполнена.
         """
         relative_path = os.path.relpath(path, start=self.local_folder).replace("\\", "/")
         upload_path = f"{self.cloud_folder}/{relative_path}"
@@ -96,7 +208,7 @@ class YandexDiskUploader:
             response = self.session.get(check_url, headers=self.headers)
             if response.status_code == 200 and not overwrite:
                 print(f"Файл {upload_path} уже существует и не будет перезаписан.")
-                return
+                return None
             elif response.status_code == 404 or (response.status_code == 200 and overwrite):
                 url = f"https://cloud-api.yandex.net/v1/disk/resources/upload?path={upload_path}&overwrite={str(overwrite).lower()}"
                 response = self.session.get(url, headers=self.headers)
@@ -106,36 +218,114 @@ class YandexDiskUploader:
                     response = self.session.put(upload_url, files={"file": file})
                     response.raise_for_status()
                     print(f"Файл {upload_path} успешно загружен.")
+                return self._get_resource_info(upload_path)
         except requests.RequestException as e:
             print(f"Ошибка при загрузке файла {path}: {e}")
-    
-    
+        return None
+
+    def _get_resource_info(self, path: str) -> Optional[RemoteFileInfo]:
+        """
+        Получает метаданные файла в облаке (размер, хеши и ревизию).
+
+        :param path: Полный путь к файлу в облаке.
+        :return: Метаданные файла или None, если их не удалось получить.
+        """
+        url = f"https://cloud-api.yandex.net/v1/disk/resources?path={path}&fields={RESOURCE_FIELDS}"
+        try:
+            response = self.session.get(url, headers=self.headers)
+            response.raise_for_status()
+            return RemoteFileInfo.from_resource(response.json())
+        except requests.RequestException as e:
+            print(f"Ошибка при получении информации о файле {path}: {e}")
+            return None
+
+
+    def prepare_directories(self, relative_paths: Iterable[str]) -> None:
+        """
+        Заранее создает в облаке все отсутствующие родительские папки для файлов цикла.
+
+        Папки создаются по уровням вложенности: все папки одного уровня создаются параллельно,
+        после чего начинается следующий уровень. Уже известные папки пропускаются, поэтому
+        последующие загрузки не обращаются к API создания папок.
+
+        :param relative_paths: Относительные пути файлов, которые будут загружены.
+        """
+        missing: Set[str] = set()
+        with self._dirs_lock:
+            for relative_path in relative_paths:
+                parts = f"{self.cloud_folder}/{relative_path}".replace("\\", "/").split("/")[:-1]
+                for i in range(len(parts), 0, -1):
+                    sub_path = "/".join(parts[:i])
+                    if sub_path in self._known_dirs or sub_path in missing:
+                        break  # Папка и все ее родители уже учтены
+                    missing.add(sub_path)
+        if not missing:
+            return
+
+        levels: Dict[int, List[str]] = {}
+        for path in missing:
+            levels.setdefault(path.count("/"), []).append(path)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.listing_workers) as executor:
+            for depth in sorted(levels):
+                list(executor.map(self._ensure_directory, levels[depth]))
+
     def _create_remote_directory(self, path: str) -> None:
         """
-        Рекурсивно создает все вложенные папки на Яндекс.Диске с блокировкой для многопоточности.
+        Рекурсивно создает все вложенные папки на Яндекс.Диске.
+
+        Существующие папки берутся из кэша без обращения к API; создание каждой папки защищено
+        отдельной блокировкой, поэтому потоки, создающие разные папки, не ждут друг друга.
 
         :param path: Путь к папке, которую нужно создать в облаке.
         """
+        if path in self._known_dirs:
+            return
         parts = path.split("/")
         for i in range(1, len(parts) + 1):
-            sub_path = "/".join(parts[:i])
+            if not self._ensure_directory("/".join(parts[:i])):
+                break
+
+    def _ensure_directory(self, sub_path: str) -> bool:
+        """
+        Создает одну папку в облаке, если ее нет в кэше существующих папок.
+
+        :param sub_path: Полный путь к папке в облаке.
+        :return: True, если папка существует или создана.
+        """
+        if sub_path in self._known_dirs:
+            return True
+        with self._dirs_lock:
+            lock = self._dir_locks.setdefault(sub_path, threading.Lock())
+
+        with lock:
+            if sub_path in self._known_dirs:
+                return True  # Папку создал другой поток, пока мы ждали блокировку
             url = f"https://cloud-api.yandex.net/v1/disk/resources?path={sub_path}"
+            try:
+                response = self.session.put(url, headers=self.headers)
+                if response.status_code == 409 and self._is_existing_directory_error(response):
+                    pass  # Папка уже существует
+                else:
+                    response.raise_for_status()
+                    print(f"Папка {sub_path} успешно создана.")
+            except requests.RequestException as e:
+                print(f"Ошибка при создании директории {sub_path}: {e}")
+                return False
+            with self._dirs_lock:
+                self._known_dirs.add(sub_path)
+                self._dir_locks.pop(sub_path, None)
+            return True
+
+    @staticmethod
+    def _is_existing_directory_error(response: requests.Response) -> bool:
+        """
+        Проверяет, означает ли ответ 409, что папка уже существует (а не отсутствует родительская папка).
 
-            # Блокируем доступ для проверки и создания папки
-            with self.folder_lock:
-                try:
-                    response = self.session.get(url, headers=self.headers)
-                    if response.status_code == 200:
-                        continue  # Папка существует
-                    elif response.status_code == 404:
-                        # Папка не существует, создаем её
-                        response = self.session.put(url, headers=self.headers)
-                        response.raise_for_status()
-                        print(f"Папка {sub_path} успешно создана.")
-                    elif response.status_code == 409:
-                        # Папка уже существует, конфликт устранен
-                        print(f"Папка {sub_path} уже существует.")
-                        continue
-                except requests.RequestException as e:
-                    print(f"Ошибка при создании директории {sub_path}: {e}")
-                    break
+        :param response: Ответ API на запрос создания папки.
+        :return: True, если папка уже существует.
+        """
+        try:
+            return response.json().get("error") == "DiskPathPointsToExistentDirectoryError"
+        except ValueError:
+            return False
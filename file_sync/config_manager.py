@@ -1,3 +1,4 @@
+import os
 from configparser import ConfigParser
 from typing import Dict, Union
 
@@ -18,6 +19,15 @@ class ConfigManager:
             - 'sync_period' (int): Период синхронизации в секундах.
             - 'log_file' (str): Путь к файлу для логирования.
             - 'sync_mode' (str): Режим синхронизации, по умолчанию "files".
+            - 'state_file' (str): Путь к базе состояния синхронизации; относительный путь
+              отсчитывается от папки с файлом конфигурации, по умолчанию "sync_state.db".
+            - 'watch_mode' (str): "periodic" — полная синхронизация каждые sync_period секунд,
+              "watch" — синхронизация по событиям файловой системы, по умолчанию "periodic".
+            - 'watch_debounce' (float): Время тишины в секундах для объединения серии событий.
+            - 'full_sync_period' (int): Период полной сверки в режиме "watch" в секундах.
+            - 'scan_workers' (int): Количество потоков для обхода локальной папки, по умолчанию 1.
+            - 'compare_content' (bool): Сравнивать содержимое файлов с md5/sha256 в облаке, по умолчанию False.
+            - 'hash_workers' (int): Количество процессов для хеширования; 0 — по числу ядер.
         """
         config = ConfigParser()
         config.read(config_path, encoding="utf-8")
@@ -27,5 +37,15 @@ class ConfigManager:
             'access_token': config.get("settings", "access_token"),
             'sync_period': config.getint("settings", "sync_period"),
             'log_file': config.get("settings", "log_file"),
-            'sync_mode': config.get("settings", "sync_mode", fallback="files")  # добавили sync_mode
+            'sync_mode': config.get("settings", "sync_mode", fallback="files"),  # добавили sync_mode
+            'state_file': os.path.join(
+                os.path.dirname(os.path.abspath(config_path)),
+                config.get("settings", "state_file", fallback="sync_state.db"),
+            ),
+            'watch_mode': config.get("settings", "watch_mode", fallback="periodic"),
+            'watch_debounce': config.getfloat("settings", "watch_debounce", fallback=1.0),
+            'full_sync_period': config.getint("settings", "full_sync_period", fallback=3600),
+            'scan_workers': config.getint("settings", "scan_workers", fallback=1),
+            'compare_content': config.getboolean("settings", "compare_content", fallback=False),
+            'hash_workers': config.getint("settings", "hash_workers", fallback=0),
         }
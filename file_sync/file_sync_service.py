@@ -1,11 +1,17 @@
 import os
+import stat
 import concurrent.futures
-from file_sync.sync_utils import get_local_files_info
+from typing import Callable, Iterable, List, Optional, Tuple
+from file_sync.sync_utils import DEFAULT_SCAN_WORKERS, LocalFileInfo, get_local_files_info
+from file_sync.sync_state import SyncRecord, SyncStateStore
+from file_sync.hashing import ContentHasher
 import logging
 
 
 class FileSyncService:
-    def __init__(self, local_folder: str, uploader, logger: logging.Logger, sync_mode: str = "files", max_workers: int = 10) -> None:
+    def __init__(self, local_folder: str, uploader, logger: logging.Logger, sync_mode: str = "files", max_workers: int = 10,
+                 state_store: Optional[SyncStateStore] = None, scan_workers: int = DEFAULT_SCAN_WORKERS,
+                 compare_content: bool = False, hash_workers: Optional[int] = None) -> None:
         """
         Инициализирует сервис синхронизации файлов с указанными параметрами.
 
@@ -15,12 +21,21 @@ class FileSyncService:
         - logger (logging.Logger): Логгер для записи событий и ошибок.
         - sync_mode (str): Режим синхронизации; "files" для синхронизации только файлов, "all" для файлов и папок.
         - max_workers (int): Максимальное количество потоков для многопоточности.
+        - state_store (Optional[SyncStateStore]): Хранилище состояния выгруженных файлов; по умолчанию хранится в памяти.
+        - scan_workers (int): Количество потоков для обхода локальной папки.
+        - compare_content (bool): Сравнивать содержимое измененных файлов с md5/sha256 копии в облаке
+          и не выгружать файлы с совпадающим содержимым.
+        - hash_workers (Optional[int]): Количество процессов для хеширования; по умолчанию — число ядер.
         """
         self.local_folder = local_folder
         self.uploader = uploader
         self.logger = logger
         self.sync_mode = sync_mode
         self.max_workers = max_workers  # Количество потоков для многопоточности
+        self.state = state_store if state_store is not None else SyncStateStore()
+        self.scan_workers = scan_workers
+        self.compare_content = compare_content
+        self.hasher = ContentHasher(self.state, hash_workers)
 
 
     def run_sync_cycle(self) -> None:
@@ -38,44 +53,250 @@ class FileSyncService:
     def synchronize_files(self) -> None:
         """
         Выполняет синхронизацию файлов между локальной папкой и облачным хранилищем.
-        
-        Метод использует многопоточность для параллельной загрузки, обновления и удаления файлов.
-        Ожидает завершения всех задач и обрабатывает результаты, записывая ошибки при возникновении исключений.
+
+        Изменения определяются по хранилищу состояния: файл выгружается, только если его размер,
+        время изменения или inode отличаются от последней выгруженной версии либо если файл
+        в облаке был изменен или удален. Метод использует многопоточность для параллельной загрузки,
+        обновления и удаления файлов, а после завершения задач сохраняет новое состояние.
         """
         # Получаем информацию о файлах в облаке
         cloud_files = self.uploader.get_info()
-        
+
         # Получаем информацию о локальных файлах и папках в зависимости от sync_mode
-        local_files = get_local_files_info(self.local_folder, self.sync_mode)
+        local_files = get_local_files_info(self.local_folder, self.sync_mode, max_workers=self.scan_workers)
+
+        uploads = []
+        for filename, local_info in local_files.items():
+            if filename in cloud_files:
+                if self._is_synced(filename, local_info, cloud_files[filename]):
+                    continue  # Пропускаем файл, если он не изменился
+                uploads.append((filename, local_info, True))  # Обновляем измененные файлы
+            else:
+                uploads.append((filename, local_info, False))  # Загружаем новый файл
+
+        if self.compare_content:
+            uploads = self._skip_identical(uploads, cloud_files.get)
+
+        # Удаляем из облака файлы, отсутствующие локально
+        deletes = [filename for filename in cloud_files if filename not in local_files]
+
+        self._run_tasks(uploads, deletes)
+
+
+    def run_change_cycle(self, changed_paths: Iterable[str]) -> None:
+        """
+        Синхронизирует только указанные измененные пути и записывает результаты в лог.
+        В случае ошибки записывает сообщение об ошибке и продолжает работу.
+
+        Параметры:
+        - changed_paths (Iterable[str]): Относительные пути измененных файлов и папок.
+        """
+        self.logger.info("Запуск синхронизации изменений")
+        try:
+            self.synchronize_changes(changed_paths)
+        except Exception as e:
+            self.logger.error(f"Общая ошибка при синхронизации изменений: {e}", exc_info=True)
+
+
+    def synchronize_changes(self, changed_paths: Iterable[str]) -> None:
+        """
+        Синхронизирует только указанные пути без полного обхода локальной папки и листинга облака.
+
+        О наличии файла в облаке судит хранилище состояния: файлы из него перезаписываются,
+        остальные загружаются как новые. Пропавшие пути (включая папки целиком) удаляются из облака.
+
+        Параметры:
+        - changed_paths (Iterable[str]): Относительные пути измененных файлов и папок.
+        """
+        uploads = []
+        deletes = []
+        for relative_path in set(changed_paths):
+            full_path = os.path.join(self.local_folder, relative_path)
+            try:
+                st = os.stat(full_path)
+            except FileNotFoundError:
+                # Путь удален: это может быть файл или целая папка
+                if self.state.get(relative_path) is not None:
+                    deletes.append(relative_path)
+                deletes.extend(self.state.paths_under(relative_path))
+                continue
+
+            if stat.S_ISDIR(st.st_mode):
+                changed_files = {
+                    os.path.join(relative_path, filename): info
+                    for filename, info in get_local_files_info(full_path, self.sync_mode, max_workers=self.scan_workers).items()
+                }
+            elif stat.S_ISREG(st.st_mode):
+                changed_files = {relative_path: LocalFileInfo(st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)}
+            else:
+                continue
+
+            for filename, local_info in changed_files.items():
+                record = self.state.get(filename)
+                if self._matches_record(record, local_info):
+                    continue  # Событие без изменения содержимого (например, повторное закрытие файла)
+                uploads.append((filename, local_info, record is not None))
+
+        if self.compare_content:
+            # Облако не запрашивается: содержимое сравнивается с md5 последней выгруженной версии
+            uploads = self._skip_identical(uploads, self.state.get)
+
+        self._run_tasks(uploads, deletes)
+
+
+    def _run_tasks(self, uploads: List[Tuple[str, LocalFileInfo, bool]], deletes: List[str]) -> None:
+        """
+        Параллельно выполняет загрузку, обновление и удаление файлов и сохраняет новое состояние.
+
+        Ожидает завершения всех задач и обрабатывает результаты, записывая ошибки при возникновении исключений.
+
+        Параметры:
+        - uploads (List[Tuple[str, LocalFileInfo, bool]]): Файлы для выгрузки: (относительный путь,
+          метаданные, True для перезаписи существующего файла).
+        - deletes (List[str]): Относительные пути файлов для удаления из облака.
+        """
+        # Создаем все недостающие папки в облаке заранее, чтобы загрузки не обращались к API создания папок
+        if uploads:
+            self.uploader.prepare_directories(filename for filename, _, _ in uploads)
 
         # Создаем пул потоков для загрузки и удаления файлов
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = []
+            futures = {}
 
             # Добавляем задачи на загрузку и обновление файлов
-            for filename, local_mtime in local_files.items():
-                if filename in cloud_files:
-                    cloud_mtime = cloud_files[filename]
-                    if local_mtime == cloud_mtime:
-                        continue  # Пропускаем файл, если он не изменился
-
-                    # Обновляем измененные файлы
+            for filename, local_info, overwrite in uploads:
+                full_path = os.path.join(self.local_folder, filename)
+                if overwrite:
                     self.logger.info(f"Файл {filename} обновляется в облаке.")
-                    futures.append(executor.submit(self.uploader.reload, os.path.join(self.local_folder, filename)))
+                    future = executor.submit(self.uploader.reload, full_path)
                 else:
-                    # Загружаем новый файл
                     self.logger.info(f"Новый файл {filename} загружается в облако.")
-                    futures.append(executor.submit(self.uploader.load, os.path.join(self.local_folder, filename)))
+                    future = executor.submit(self.uploader.load, full_path)
+                futures[future] = (filename, local_info)
 
-            # Добавляем задачи на удаление файлов, отсутствующих локально
-            for filename in cloud_files:
-                if filename not in local_files:
-                    self.logger.info(f"Файл {filename} удаляется из облака.")
-                    futures.append(executor.submit(self.uploader.delete, filename))
+            # Добавляем задачи на удаление файлов
+            for filename in deletes:
+                self.logger.info(f"Файл {filename} удаляется из облака.")
+                futures[executor.submit(self.uploader.delete, filename)] = (filename, None)
 
             # Ожидаем завершения всех задач и обрабатываем результаты
             for future in concurrent.futures.as_completed(futures):
+                filename, local_info = futures[future]
                 try:
-                    future.result()  # Получаем результат задачи и обрабатываем исключения, если есть
+                    result = future.result()  # Получаем результат задачи и обрабатываем исключения, если есть
                 except Exception as e:
                     self.logger.error(f"Ошибка при выполнении задачи: {e}", exc_info=True)
+                    continue
+                self._record_result(filename, local_info, result)
+
+        self.state.commit()
+
+
+    def _is_synced(self, filename: str, local_info: LocalFileInfo, cloud_info) -> bool:
+        """
+        Проверяет, совпадает ли файл с последней выгруженной версией.
+
+        Параметры:
+        - filename (str): Относительный путь к файлу.
+        - local_info (LocalFileInfo): Текущие метаданные локального файла.
+        - cloud_info: Метаданные файла в облаке (RemoteFileInfo).
+
+        Возвращает:
+        - bool: True, если файл не менялся ни локально, ни в облаке с момента последней выгрузки.
+        """
+        record = self.state.get(filename)
+        if not self._matches_record(record, local_info):
+            return False
+        cloud_md5 = getattr(cloud_info, "md5", None)
+        return not (record.md5 and cloud_md5 and record.md5 != cloud_md5)
+
+
+    @staticmethod
+    def _matches_record(record: Optional[SyncRecord], local_info: LocalFileInfo) -> bool:
+        """
+        Проверяет, совпадают ли метаданные локального файла с последней выгруженной версией.
+
+        Параметры:
+        - record (Optional[SyncRecord]): Сохраненное состояние файла.
+        - local_info (LocalFileInfo): Текущие метаданные локального файла.
+
+        Возвращает:
+        - bool: True, если размер, время изменения и inode не изменились.
+        """
+        return record is not None and (record.size, record.mtime_ns, record.inode) == (
+            local_info.size, local_info.mtime_ns, local_info.inode
+        )
+
+
+    def _skip_identical(self, uploads: List[Tuple[str, LocalFileInfo, bool]],
+                        remote_lookup: Callable) -> List[Tuple[str, LocalFileInfo, bool]]:
+        """
+        Исключает из выгрузки файлы, содержимое которых совпадает с копией в облаке.
+
+        Хешируются только перезаписываемые файлы того же размера, для которых известен md5 или sha256
+        копии в облаке. Для совпавших файлов сохраняется новое состояние без передачи данных.
+
+        Параметры:
+        - uploads (List[Tuple[str, LocalFileInfo, bool]]): Запланированные выгрузки.
+        - remote_lookup (Callable): Функция, возвращающая по относительному пути метаданные копии
+          в облаке (поля size, md5, sha256, revision) или None.
+
+        Возвращает:
+        - List[Tuple[str, LocalFileInfo, bool]]: Выгрузки, которые все еще нужно выполнить.
+        """
+        candidates = {}
+        for filename, local_info, overwrite in uploads:
+            remote_info = remote_lookup(filename) if overwrite else None
+            if remote_info is None or remote_info.size != local_info.size:
+                continue
+            if getattr(remote_info, "md5", None) or getattr(remote_info, "sha256", None):
+                candidates[filename] = (local_info, remote_info)
+        if not candidates:
+            return uploads
+
+        hashes = self.hasher.hash_many(
+            (filename, os.path.join(self.local_folder, filename), local_info)
+            for filename, (local_info, _) in candidates.items()
+        )
+
+        identical = set()
+        for filename, file_hashes in hashes.items():
+            local_info, remote_info = candidates[filename]
+            remote_md5 = getattr(remote_info, "md5", None)
+            remote_sha256 = getattr(remote_info, "sha256", None)
+            if (remote_md5 and remote_md5 != file_hashes.md5) or (remote_sha256 and remote_sha256 != file_hashes.sha256):
+                continue
+            self.logger.info(f"Файл {filename} совпадает с копией в облаке, выгрузка пропущена.")
+            self.state.put(filename, SyncRecord(
+                size=local_info.size,
+                mtime_ns=local_info.mtime_ns,
+                inode=local_info.inode,
+                md5=file_hashes.md5,
+                revision=getattr(remote_info, "revision", None),
+            ))
+            identical.add(filename)
+
+        return [upload for upload in uploads if upload[0] not in identical]
+
+
+    def _record_result(self, filename: str, local_info: Optional[LocalFileInfo], result) -> None:
+        """
+        Обновляет хранилище состояния по результату выполненной задачи.
+
+        Параметры:
+        - filename (str): Относительный путь к файлу.
+        - local_info (Optional[LocalFileInfo]): Метаданные выгруженного файла; None для удаления.
+        - result: Результат задачи: метаданные файла в облаке после выгрузки или признак успешного удаления.
+        """
+        if not result:
+            return  # Задача не выполнена, файл будет обработан в следующем цикле
+        if local_info is None:
+            self.state.delete(filename)
+            return
+        self.state.put(filename, SyncRecord(
+            size=local_info.size,
+            mtime_ns=local_info.mtime_ns,
+            inode=local_info.inode,
+            md5=getattr(result, "md5", None),
+            revision=getattr(result, "revision", None),
+        ))
@@ -0,0 +1,116 @@
+import os
+import hashlib
+import concurrent.futures
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from file_sync.sync_utils import LocalFileInfo
+
+# Размер буфера чтения при вычислении хешей
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Если файлов для хеширования меньше, они обрабатываются в текущем процессе без запуска пула
+MIN_FILES_FOR_POOL = 4
+
+
+class FileHashes(NamedTuple):
+    """
+    Хеши содержимого файла в формате, который использует API Яндекс.Диска.
+
+    Поля:
+    - md5 (str): MD5-хеш в шестнадцатеричном виде.
+    - sha256 (str): SHA256-хеш в шестнадцатеричном виде.
+    """
+    md5: str
+    sha256: str
+
+
+def hash_file(path: str) -> FileHashes:
+    """
+    Вычисляет MD5 и SHA256 файла за одно потоковое чтение с большим переиспользуемым буфером.
+
+    Параметры:
+    - path (str): Путь к файлу.
+
+    Возвращает:
+    - FileHashes: Хеши содержимого файла.
+    """
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as file:
+        while True:
+            read = file.readinto(buffer)
+            if not read:
+                break
+            md5.update(view[:read])
+            sha256.update(view[:read])
+    return FileHashes(md5.hexdigest(), sha256.hexdigest())
+
+
+class ContentHasher:
+    def __init__(self, state_store, max_workers: Optional[int] = None) -> None:
+        """
+        Инициализирует вычисление хешей с кэшем в хранилище состояния синхронизации.
+
+        Хеш файла кэшируется по ключу (устройство, inode, размер, mtime_ns), поэтому каждый файл
+        хешируется не чаще одного раза на реальное изменение. Файлы хешируются параллельно в пуле процессов.
+
+        Параметры:
+        - state_store (SyncStateStore): Хранилище состояния, в котором хранится кэш хешей.
+        - max_workers (Optional[int]): Количество процессов; по умолчанию — число ядер процессора.
+        """
+        self.state = state_store
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def hash_many(self, files: Iterable[Tuple[str, str, LocalFileInfo]]) -> Dict[str, FileHashes]:
+        """
+        Возвращает хеши файлов, вычисляя в пуле процессов только те, которых нет в кэше.
+
+        Параметры:
+        - files (Iterable[Tuple[str, str, LocalFileInfo]]): Тройки (относительный путь, полный путь, метаданные).
+
+        Возвращает:
+        - Dict[str, FileHashes]: Хеши по относительным путям; файлы, которые не удалось прочитать, отсутствуют.
+        """
+        result: Dict[str, FileHashes] = {}
+        missing = []
+        for relative_path, full_path, info in files:
+            cached = self.state.get_hash(info)
+            if cached is not None:
+                result[relative_path] = FileHashes(*cached)
+            else:
+                missing.append((relative_path, full_path, info))
+
+        if len(missing) < MIN_FILES_FOR_POOL or self.max_workers <= 1:
+            for relative_path, full_path, info in missing:
+                try:
+                    result[relative_path] = self._store(info, hash_file(full_path))
+                except OSError:
+                    continue  # Файл удален или недоступен, он будет обработан в следующем цикле
+        elif missing:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                futures = {executor.submit(hash_file, full_path): (relative_path, info) for relative_path, full_path, info in missing}
+                for future in concurrent.futures.as_completed(futures):
+                    relative_path, info = futures[future]
+                    try:
+                        result[relative_path] = self._store(info, future.result())
+                    except OSError:
+                        continue
+
+        self.state.commit()
+        return result
+
+    def _store(self, info: LocalFileInfo, hashes: FileHashes) -> FileHashes:
+        """
+        Сохраняет вычисленные хеши в кэш.
+
+        Параметры:
+        - info (LocalFileInfo): Метаданные файла, по которым строится ключ кэша.
+        - hashes (FileHashes): Хеши содержимого.
+
+        Возвращает:
+        - FileHashes: Те же хеши (для удобства цепочки вызовов).
+        """
+        self.state.put_hash(info, hashes.md5, hashes.sha256)
+        return hashes
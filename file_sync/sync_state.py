@@ -0,0 +1,180 @@
+import sqlite3
+import threading
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+
+class SyncRecord(NamedTuple):
+    """
+    Сведения о последней успешно выгруженной версии файла.
+
+    Поля:
+    - size (int): Размер файла в байтах на момент выгрузки.
+    - mtime_ns (int): Время последнего изменения файла в наносекундах.
+    - inode (int): Номер inode локального файла.
+    - md5 (Optional[str]): MD5-хеш файла, который вернул Яндекс.Диск.
+    - revision (Optional[int]): Ревизия ресурса на Яндекс.Диске.
+    """
+    size: int
+    mtime_ns: int
+    inode: int
+    md5: Optional[str] = None
+    revision: Optional[int] = None
+
+
+class SyncStateStore:
+    def __init__(self, db_path: str = ":memory:") -> None:
+        """
+        Инициализирует локальное хранилище состояния синхронизации на базе SQLite.
+
+        Для каждого относительного пути хранится то, что было выгружено в облако последним,
+        поэтому неизмененные файлы не выгружаются повторно даже после перезапуска сервиса.
+
+        Параметры:
+        - db_path (str): Путь к файлу базы данных; ":memory:" — хранение только в памяти процесса.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "inode INTEGER NOT NULL, "
+            "md5 TEXT, "
+            "revision INTEGER)"
+        )
+        # Кэш хешей содержимого: запись действительна, пока размер и время изменения файла не поменялись
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "device INTEGER NOT NULL, "
+            "inode INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "md5 TEXT NOT NULL, "
+            "sha256 TEXT NOT NULL, "
+            "PRIMARY KEY (device, inode))"
+        )
+        self._conn.commit()
+
+    def get(self, path: str) -> Optional[SyncRecord]:
+        """
+        Возвращает сохраненное состояние файла.
+
+        Параметры:
+        - path (str): Относительный путь к файлу.
+
+        Возвращает:
+        - Optional[SyncRecord]: Запись о файле или None, если файл еще не выгружался.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, inode, md5, revision FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        return SyncRecord(*row) if row else None
+
+    def put(self, path: str, record: SyncRecord) -> None:
+        """
+        Сохраняет состояние файла после успешной выгрузки.
+
+        Параметры:
+        - path (str): Относительный путь к файлу.
+        - record (SyncRecord): Сведения о выгруженной версии файла.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, inode, md5, revision) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, *record),
+            )
+
+    def delete(self, path: str) -> None:
+        """
+        Удаляет состояние файла после его удаления из облака.
+
+        Параметры:
+        - path (str): Относительный путь к файлу.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def items(self) -> Iterator[Tuple[str, SyncRecord]]:
+        """
+        Перебирает все сохраненные записи в порядке относительных путей.
+
+        Возвращает:
+        - Iterator[Tuple[str, SyncRecord]]: Пары (относительный путь, запись).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns, inode, md5, revision FROM files ORDER BY path"
+            ).fetchall()
+        for path, *fields in rows:
+            yield path, SyncRecord(*fields)
+
+    def paths_under(self, directory: str) -> List[str]:
+        """
+        Возвращает пути всех сохраненных файлов внутри указанной папки.
+
+        Параметры:
+        - directory (str): Относительный путь к папке.
+
+        Возвращает:
+        - List[str]: Относительные пути файлов во всех вложенных папках.
+        """
+        prefix = directory.rstrip("/") + "/"
+        # Все строки с префиксом "dir/" лежат в диапазоне ["dir/", "dir0"), так как "0" следует за "/"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM files WHERE path >= ? AND path < ?", (prefix, prefix[:-1] + "0")
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_hash(self, info) -> Optional[Tuple[str, str]]:
+        """
+        Возвращает закэшированные хеши содержимого файла.
+
+        Параметры:
+        - info (LocalFileInfo): Метаданные файла (устройство, inode, размер, время изменения).
+
+        Возвращает:
+        - Optional[Tuple[str, str]]: Пара (md5, sha256) или None, если файл менялся после хеширования.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT md5, sha256 FROM hashes WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                (info.device, info.inode, info.size, info.mtime_ns),
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def put_hash(self, info, md5: str, sha256: str) -> None:
+        """
+        Сохраняет хеши содержимого файла в кэш.
+
+        Параметры:
+        - info (LocalFileInfo): Метаданные файла, по которым строится ключ кэша.
+        - md5 (str): MD5-хеш содержимого.
+        - sha256 (str): SHA256-хеш содержимого.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hashes (device, inode, size, mtime_ns, md5, sha256) VALUES (?, ?, ?, ?, ?, ?)",
+                (info.device, info.inode, info.size, info.mtime_ns, md5, sha256),
+            )
+
+    def commit(self) -> None:
+        """
+        Фиксирует накопленные изменения на диске.
+        """
+        with self._lock:
+            self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Фиксирует изменения и закрывает соединение с базой данных.
+        """
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
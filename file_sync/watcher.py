@@ -0,0 +1,269 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Dict, Optional, Set
+
+from file_sync.sync_utils import get_local_files_info
+
+# Флаги inotify из <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+# Заголовок события inotify: wd, mask, cookie, len
+EVENT_HEADER = struct.Struct("iIII")
+
+DEFAULT_IGNORE_DIRS = {".git", ".vscode", "__pycache__"}
+
+
+def _is_ignored(name: str, ignore_dirs: Set[str]) -> bool:
+    """
+    Проверяет, нужно ли пропускать файл или папку с указанным именем (те же правила, что и при сканировании).
+
+    Параметры:
+    - name (str): Имя файла или папки.
+    - ignore_dirs (Set[str]): Имена игнорируемых папок.
+
+    Возвращает:
+    - bool: True, если элемент скрытый или игнорируемый.
+    """
+    return name.startswith('.') or name in ignore_dirs
+
+
+class InotifyWatcher:
+    def __init__(self, folder_path: str, debounce: float = 1.0, max_delay: float = 10.0,
+                 ignore_dirs: Optional[Set[str]] = None) -> None:
+        """
+        Инициализирует наблюдение за изменениями в папке через Linux inotify (через ctypes).
+
+        Параметры:
+        - folder_path (str): Путь к локальной папке для наблюдения (рекурсивно).
+        - debounce (float): Время тишины в секундах, после которого накопленные изменения отдаются на синхронизацию.
+        - max_delay (float): Максимальное время накопления изменений при непрерывном потоке событий.
+        - ignore_dirs (Optional[Set[str]]): Имена папок, за которыми не нужно следить.
+
+        Исключения:
+        - OSError: Если inotify недоступен на этой платформе.
+        """
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc недоступна, inotify не поддерживается")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify не поддерживается на этой платформе")
+
+        self.folder_path = folder_path
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.ignore_dirs = DEFAULT_IGNORE_DIRS if ignore_dirs is None else ignore_dirs
+
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self._watches: Dict[int, str] = {}  # wd -> относительный путь папки ("" — корень)
+        self._overflow = False
+        self._add_watches("")
+
+    def _add_watch(self, relative_dir: str) -> bool:
+        """
+        Добавляет наблюдение за одной папкой.
+
+        Параметры:
+        - relative_dir (str): Путь к папке относительно корня наблюдения.
+
+        Возвращает:
+        - bool: True, если наблюдение добавлено.
+        """
+        path = os.path.join(self.folder_path, relative_dir) if relative_dir else self.folder_path
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if errno == 28:  # ENOSPC: превышен лимит fs.inotify.max_user_watches
+                self._overflow = True
+            return False
+        self._watches[wd] = relative_dir
+        return True
+
+    def _add_watches(self, relative_dir: str) -> Set[str]:
+        """
+        Рекурсивно добавляет наблюдение за папкой и всеми вложенными папками.
+
+        Параметры:
+        - relative_dir (str): Путь к папке относительно корня наблюдения.
+
+        Возвращает:
+        - Set[str]: Относительные пути файлов, найденных в добавленных папках.
+        """
+        files = set()
+        stack = [relative_dir]
+        while stack:
+            current = stack.pop()
+            if not self._add_watch(current):
+                continue
+            path = os.path.join(self.folder_path, current) if current else self.folder_path
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if _is_ignored(entry.name, self.ignore_dirs):
+                            continue
+                        relative_path = os.path.join(current, entry.name) if current else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(relative_path)
+                        else:
+                            files.add(relative_path)
+            except OSError:
+                continue  # Папку удалили до того, как мы успели ее прочитать
+        return files
+
+    def _read_events(self, changes: Set[str]) -> None:
+        """
+        Читает все доступные события inotify и добавляет измененные пути в множество.
+
+        Параметры:
+        - changes (Set[str]): Множество относительных путей, в которое добавляются изменения.
+        """
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    self._overflow = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                relative_dir = self._watches.get(wd)
+                if relative_dir is None or not name or _is_ignored(name, self.ignore_dirs):
+                    continue
+
+                relative_path = os.path.join(relative_dir, name) if relative_dir else name
+                changes.add(relative_path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Файлы могли появиться в новой папке до того, как мы начали за ней следить
+                    changes.update(self._add_watches(relative_path))
+
+    def wait_for_changes(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Ожидает изменений и объединяет серию событий по каждому пути.
+
+        После первого события изменения накапливаются, пока в течение `debounce` секунд не будет
+        новых событий (но не дольше `max_delay` секунд).
+
+        Параметры:
+        - timeout (float): Максимальное время ожидания первого события в секундах.
+
+        Возвращает:
+        - Optional[Set[str]]: Относительные пути измененных файлов и папок (пустое множество по таймауту)
+          или None, если события были потеряны и нужна полная синхронизация.
+        """
+        changes: Set[str] = set()
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return None if self._overflow else changes
+
+        started = time.monotonic()
+        self._read_events(changes)
+        while time.monotonic() - started < self.max_delay:
+            readable, _, _ = select.select([self._fd], [], [], self.debounce)
+            if not readable:
+                break
+            self._read_events(changes)
+
+        if self._overflow:
+            self._overflow = False
+            return None
+        return changes
+
+    def close(self) -> None:
+        """
+        Прекращает наблюдение и закрывает дескриптор inotify.
+        """
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    def __init__(self, folder_path: str, poll_interval: float = 10.0, ignore_dirs: Optional[Set[str]] = None) -> None:
+        """
+        Инициализирует наблюдение за изменениями путем периодического сканирования папки.
+        Используется, если inotify недоступен.
+
+        Параметры:
+        - folder_path (str): Путь к локальной папке для наблюдения.
+        - poll_interval (float): Интервал между сканированиями в секундах.
+        - ignore_dirs (Optional[Set[str]]): Имена папок, которые нужно игнорировать.
+        """
+        self.folder_path = folder_path
+        self.poll_interval = poll_interval
+        self.ignore_dirs = ignore_dirs
+        self._snapshot = get_local_files_info(folder_path, ignore_dirs=ignore_dirs)
+
+    def wait_for_changes(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Ожидает очередного сканирования и возвращает пути, изменившиеся с прошлого сканирования.
+
+        Параметры:
+        - timeout (float): Максимальное время ожидания в секундах.
+
+        Возвращает:
+        - Optional[Set[str]]: Относительные пути измененных, новых и удаленных файлов.
+        """
+        time.sleep(max(min(timeout, self.poll_interval), 0))
+        snapshot = get_local_files_info(self.folder_path, ignore_dirs=self.ignore_dirs)
+        changes = {path for path, info in snapshot.items() if self._snapshot.get(path) != info}
+        changes.update(path for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changes
+
+    def close(self) -> None:
+        """
+        Прекращает наблюдение (для совместимости с InotifyWatcher).
+        """
+
+
+def create_watcher(folder_path: str, debounce: float = 1.0, poll_interval: float = 10.0, ignore_dirs: Optional[Set[str]] = None):
+    """
+    Создает наблюдатель за изменениями: inotify, если он доступен, иначе периодическое сканирование.
+
+    Параметры:
+    - folder_path (str): Путь к локальной папке для наблюдения.
+    - debounce (float): Время тишины для объединения серии событий (только для inotify).
+    - poll_interval (float): Интервал сканирования для резервного режима.
+    - ignore_dirs (Optional[Set[str]]): Имена папок, которые нужно игнорировать.
+
+    Возвращает:
+    - InotifyWatcher | PollingWatcher: Наблюдатель с методами `wait_for_changes` и `close`.
+    """
+    try:
+        return InotifyWatcher(folder_path, debounce=debounce, max_delay=max(debounce * 10, 1.0), ignore_dirs=ignore_dirs)
+    except (OSError, AttributeError):
+        return PollingWatcher(folder_path, poll_interval=poll_interval, ignore_dirs=ignore_dirs)
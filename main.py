@@ -2,6 +2,8 @@ import time
 from file_sync.config_manager import ConfigManager
 from sync_logger import setup_logger
 from file_sync.file_sync_service import FileSyncService
+from file_sync.sync_state import SyncStateStore
+from file_sync.watcher import create_watcher
 from cloud_storage.yandex_disk import YandexDiskUploader
 
 
@@ -14,7 +16,9 @@ def main() -> None:
     1. Загружает конфигурацию из config.ini с помощью ConfigManager.
     2. Настраивает логгер, используя указанный файл лога.
     3. Создает экземпляр YandexDiskUploader с параметрами конфигурации.
-    4. Создает и запускает сервис синхронизации файлов в заданном цикле.
+    4. Открывает хранилище состояния синхронизации рядом с config.ini.
+    5. Создает и запускает сервис синхронизации файлов в заданном цикле: с фиксированным периодом
+       или, в режиме watch_mode = watch, по событиям файловой системы.
 
     Исключения, возникающие при синхронизации, логируются и не прерывают работу программы.
     """
@@ -25,14 +29,25 @@ def main() -> None:
     # Создание экземпляра YandexDiskUploader с передачей local_folder
     uploader = YandexDiskUploader(config['access_token'], config['cloud_folder_name'], config['local_folder'])
 
+    # Хранилище состояния: что и когда было выгружено, чтобы не выгружать неизмененные файлы повторно
+    state_store = SyncStateStore(config['state_file'])
+
     # Создание и запуск сервиса синхронизации с учетом sync_mode
     sync_service = FileSyncService(
         config['local_folder'],
         uploader,
         logger,
-        sync_mode=config.get('sync_mode', 'files')
+        sync_mode=config.get('sync_mode', 'files'),
+        state_store=state_store,
+        scan_workers=config['scan_workers'],
+        compare_content=config['compare_content'],
+        hash_workers=config['hash_workers'] or None
     )
     
+    if config['watch_mode'] == 'watch':
+        run_watch_loop(sync_service, config, logger)
+        return
+
     # Запуск цикла синхронизации
     while True:
         try:
@@ -42,6 +57,42 @@ def main() -> None:
         time.sleep(config['sync_period'])
 
 
+def run_watch_loop(sync_service: FileSyncService, config: dict, logger) -> None:
+    """
+    Запускает синхронизацию по событиям файловой системы.
+
+    На синхронизацию передаются только измененные пути; полная сверка выполняется при старте,
+    раз в full_sync_period секунд и при потере событий (переполнении очереди inotify).
+
+    Параметры:
+    - sync_service (FileSyncService): Сервис синхронизации.
+    - config (dict): Конфигурация приложения.
+    - logger: Логгер для записи событий и ошибок.
+    """
+    watcher = create_watcher(
+        config['local_folder'],
+        debounce=config['watch_debounce'],
+        poll_interval=config['sync_period']
+    )
+    logger.info(f"Наблюдение за изменениями: {type(watcher).__name__}")
+
+    sync_service.run_sync_cycle()
+    last_full_sync = time.monotonic()
+    while True:
+        timeout = config['full_sync_period'] - (time.monotonic() - last_full_sync)
+        try:
+            changes = watcher.wait_for_changes(timeout)
+        except Exception as e:
+            logger.error(f"Ошибка при ожидании изменений: {e}")
+            changes = None
+
+        if changes is None or time.monotonic() - last_full_sync >= config['full_sync_period']:
+            sync_service.run_sync_cycle()
+            last_full_sync = time.monotonic()
+        elif changes:
+            sync_service.run_change_cycle(changes)
+
+
 
 
 if __name__ == "__main__":
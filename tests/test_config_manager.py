@@ -2,10 +2,12 @@ from configparser import ConfigParser
 from unittest.mock import patch, MagicMock
 from file_sync.config_manager import ConfigManager
 
+@patch.object(ConfigParser, 'getboolean', return_value=False)
+@patch.object(ConfigParser, 'getfloat', return_value=1.0)
 @patch.object(ConfigParser, 'read')
 @patch.object(ConfigParser, 'get', side_effect=lambda section, option, fallback=None: option)
 @patch.object(ConfigParser, 'getint', return_value=30)
-def test_load_config(mock_get: MagicMock, mock_getint: MagicMock, mock_read: MagicMock) -> None:
+def test_load_config(mock_get: MagicMock, mock_getint: MagicMock, mock_read: MagicMock, mock_getfloat: MagicMock, mock_getboolean: MagicMock) -> None:
     """
     Тестирует функцию загрузки конфигурации `ConfigManager.load_config`, проверяя корректность возвращаемых значений.
     
@@ -18,6 +20,8 @@ def test_load_config(mock_get: MagicMock, mock_getint: MagicMock, mock_read: Mag
     - mock_get (MagicMock): Мок-объект для `ConfigParser.get`.
     - mock_getint (MagicMock): Мок-объект для `ConfigParser.getint`.
     - mock_read (MagicMock): Мок-объект для `ConfigParser.read`.
+    - mock_getfloat (MagicMock): Мок-объект для `ConfigParser.getfloat`.
+    - mock_getboolean (MagicMock): Мок-объект для `ConfigParser.getboolean`.
 
     Возвращаемое значение:
     - None: Функция теста не возвращает значений, она использует assert для проверки ожидаемого результата.
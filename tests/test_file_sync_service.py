@@ -1,7 +1,11 @@
 from unittest.mock import patch, MagicMock
 import pytest
 from file_sync.file_sync_service import FileSyncService
+from file_sync.sync_utils import LocalFileInfo
+from file_sync.sync_state import SyncRecord
+from cloud_storage.yandex_disk import RemoteFileInfo
 import os
+import hashlib
 
 @pytest.fixture
 def sync_service() -> FileSyncService:
@@ -30,12 +34,13 @@ def test_synchronize_files(sync_service: FileSyncService) -> None:
     - None: Функция теста не возвращает значений, использует `assert` для проверки результатов.
     """
     # Мокаем `get_local_files_info` для возврата тестового файла
-    with patch('file_sync.file_sync_service.get_local_files_info', return_value={"file2": 1}) as mock_local_files_info:
+    with patch('file_sync.file_sync_service.get_local_files_info', return_value={"file2": LocalFileInfo(1, 1, 1)}) as mock_local_files_info:
         # Проверяем, что `get_local_files_info` возвращает корректное значение
         assert mock_local_files_info is not None, "Ошибка инициализации мока get_local_files_info"
 
         # Пустой список облачных файлов, чтобы файл считался новым
         sync_service.uploader.get_info.return_value = {}
+        sync_service.uploader.load.return_value = RemoteFileInfo(size=1)
 
         # Выполняем синхронизацию
         sync_service.synchronize_files()
@@ -43,3 +48,100 @@ def test_synchronize_files(sync_service: FileSyncService) -> None:
         # Убедимся, что `load` был вызван для нового файла
         print(f"Вызовы load после синхронизации: {sync_service.uploader.load.call_args_list}")
         sync_service.uploader.load.assert_called_once_with(os.path.join("local_folder", "file2"))
+
+
+def test_synchronize_files_skips_unchanged(sync_service: FileSyncService) -> None:
+    """
+    Тестирует, что неизмененный файл не выгружается повторно во втором цикле синхронизации.
+
+    Тест проверяет, что:
+    - В первом цикле новый файл загружается методом `load`, а его состояние сохраняется.
+    - Во втором цикле, когда файл есть в облаке с тем же md5, ни `load`, ни `reload` не вызываются.
+    - После локального изменения файла вызывается `reload`.
+
+    Параметры:
+    - sync_service (FileSyncService): Экземпляр `FileSyncService`, предоставленный фикстурой.
+
+    Возвращает:
+    - None: Функция теста не возвращает значений, использует `assert` для проверки результатов.
+    """
+    remote_info = RemoteFileInfo(size=1, md5="abc", revision=1)
+    sync_service.uploader.load.return_value = remote_info
+    sync_service.uploader.reload.return_value = remote_info
+    sync_service.uploader.get_info.return_value = {}
+
+    with patch('file_sync.file_sync_service.get_local_files_info', return_value={"file2": LocalFileInfo(1, 100, 7)}):
+        sync_service.synchronize_files()
+        assert sync_service.uploader.load.call_count == 1
+        assert sync_service.state.get("file2").md5 == "abc"
+
+        # Второй цикл: файл уже в облаке и не менялся
+        sync_service.uploader.get_info.return_value = {"file2": remote_info}
+        sync_service.synchronize_files()
+        assert sync_service.uploader.load.call_count == 1
+        sync_service.uploader.reload.assert_not_called()
+
+    # Файл изменился локально
+    with patch('file_sync.file_sync_service.get_local_files_info', return_value={"file2": LocalFileInfo(2, 200, 7)}):
+        sync_service.synchronize_files()
+        sync_service.uploader.reload.assert_called_once_with(os.path.join("local_folder", "file2"))
+
+
+def test_synchronize_changes(sync_service: FileSyncService, tmp_path) -> None:
+    """
+    Тестирует синхронизацию только измененных путей, полученных от наблюдателя.
+
+    Тест проверяет, что:
+    - Новый файл загружается методом `load` без листинга облака.
+    - Файлы удаленной папки, известные хранилищу состояния, удаляются из облака.
+
+    Параметры:
+    - sync_service (FileSyncService): Экземпляр `FileSyncService`, предоставленный фикстурой.
+    - tmp_path: Временная папка pytest, используемая как локальная папка.
+
+    Возвращает:
+    - None: Функция теста не возвращает значений, использует `assert` для проверки результатов.
+    """
+    sync_service.local_folder = str(tmp_path)
+    sync_service.uploader.load.return_value = RemoteFileInfo(size=3)
+    sync_service.uploader.delete.return_value = True
+    (tmp_path / "new.txt").write_text("new")
+    sync_service.state.put("gone/old.txt", SyncRecord(1, 1, 1))
+
+    sync_service.synchronize_changes(["new.txt", "gone"])
+
+    sync_service.uploader.get_info.assert_not_called()
+    sync_service.uploader.load.assert_called_once_with(os.path.join(str(tmp_path), "new.txt"))
+    sync_service.uploader.delete.assert_called_once_with("gone/old.txt")
+    assert sync_service.state.get("gone/old.txt") is None
+    assert sync_service.state.get("new.txt").size == 3
+
+
+def test_synchronize_files_skips_identical_content(sync_service: FileSyncService, tmp_path) -> None:
+    """
+    Тестирует пропуск выгрузки файла, содержимое которого совпадает с копией в облаке.
+
+    Тест проверяет, что при `compare_content=True` файл, известный облаку с тем же md5,
+    не перезаписывается, а его состояние сохраняется без передачи данных.
+
+    Параметры:
+    - sync_service (FileSyncService): Экземпляр `FileSyncService`, предоставленный фикстурой.
+    - tmp_path: Временная папка pytest, используемая как локальная папка.
+
+    Возвращает:
+    - None: Функция теста не возвращает значений, использует `assert` для проверки результатов.
+    """
+    sync_service.local_folder = str(tmp_path)
+    sync_service.compare_content = True
+    (tmp_path / "same.txt").write_text("same")
+    (tmp_path / "other.txt").write_text("other")
+    sync_service.uploader.reload.return_value = RemoteFileInfo(size=5)
+    sync_service.uploader.get_info.return_value = {
+        "same.txt": RemoteFileInfo(size=4, md5=hashlib.md5(b"same").hexdigest(), revision=9),
+        "other.txt": RemoteFileInfo(size=5, md5="0" * 32),
+    }
+
+    sync_service.synchronize_files()
+
+    sync_service.uploader.reload.assert_called_once_with(os.path.join(str(tmp_path), "other.txt"))
+    assert sync_service.state.get("same.txt").revision == 9
@@ -0,0 +1,53 @@
+import hashlib
+import os
+from unittest.mock import patch
+from file_sync.hashing import ContentHasher, hash_file
+from file_sync.sync_state import SyncStateStore
+from file_sync.sync_utils import scan_local_files
+
+def test_hash_file(tmp_path) -> None:
+    """
+    Тестирует потоковое вычисление MD5 и SHA256 файла.
+
+    Тест проверяет, что результат `hash_file` совпадает с `hashlib` для файла больше буфера чтения.
+
+    Параметры:
+    - tmp_path: Временная папка pytest для тестового файла.
+
+    Возвращает:
+    - None: Функция теста не возвращает значений, использует `assert` для проверки результатов.
+    """
+    data = os.urandom(3 * 1024 * 1024 + 17)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+
+    hashes = hash_file(str(path))
+
+    assert hashes.md5 == hashlib.md5(data).hexdigest()
+    assert hashes.sha256 == hashlib.sha256(data).hexdigest()
+
+def test_content_hasher_cache(tmp_path) -> None:
+    """
+    Тестирует кэширование хешей по (устройство, inode, размер, mtime_ns).
+
+    Тест проверяет, что:
+    - Файлы хешируются в пуле процессов, а результат совпадает с `hash_file`.
+    - Повторный запрос для неизмененных файлов не читает их содержимое.
+
+    Параметры:
+    - tmp_path: Временная папка pytest для тестовых файлов.
+
+    Возвращает:
+    - None: Функция теста не возвращает значений, использует `assert` для проверки результатов.
+    """
+    for i in range(6):
+        (tmp_path / f"file{i}.txt").write_text(f"content {i}")
+    files = [(name, os.path.join(str(tmp_path), name), info) for name, info in scan_local_files(str(tmp_path)).items()]
+    hasher = ContentHasher(SyncStateStore(), max_workers=2)
+
+    hashes = hasher.hash_many(files)
+    assert hashes["file3.txt"] == hash_file(str(tmp_path / "file3.txt"))
+
+    with patch("file_sync.hashing.hash_file") as mock_hash_file:
+        assert hasher.hash_many(files) == hashes
+        mock_hash_file.assert_not_called()
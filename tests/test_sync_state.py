@@ -0,0 +1,30 @@
+import os
+from file_sync.sync_state import SyncRecord, SyncStateStore
+
+def test_sync_state_persists(tmp_path) -> None:
+    """
+    Тестирует сохранение состояния синхронизации между открытиями базы данных.
+
+    Тест проверяет, что:
+    - Запись, сохраненная методом `put` и зафиксированная `close`, доступна после повторного открытия базы.
+    - Метод `delete` удаляет запись, а `items` перебирает записи в порядке путей.
+
+    Параметры:
+    - tmp_path: Временная папка pytest для файла базы данных.
+
+    Возвращает:
+    - None: Функция теста не возвращает значений, использует `assert` для проверки результатов.
+    """
+    db_path = os.path.join(tmp_path, "state.db")
+    store = SyncStateStore(db_path)
+    store.put("b.txt", SyncRecord(10, 1000, 5, "md5-b", 3))
+    store.put("a.txt", SyncRecord(20, 2000, 6))
+    store.close()
+
+    store = SyncStateStore(db_path)
+    assert store.get("b.txt") == SyncRecord(10, 1000, 5, "md5-b", 3)
+    assert [path for path, _ in store.items()] == ["a.txt", "b.txt"]
+
+    store.delete("a.txt")
+    assert store.get("a.txt") is None
+    store.close()
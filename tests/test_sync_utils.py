@@ -1,6 +1,6 @@
 import os
 import ctypes
-from file_sync.sync_utils import is_hidden
+from file_sync.sync_utils import LocalFileInfo, is_hidden, scan_local_files
 
 def test_is_hidden() -> None:
     """
@@ -28,3 +28,33 @@ def test_is_hidden() -> None:
     if os.name == 'nt':
         ctypes.windll.kernel32.SetFileAttributesW(hidden_file, 0x80)  # Снимаем скрытие
     os.remove(hidden_file)
+
+def test_scan_local_files(tmp_path) -> None:
+    """
+    Тестирует рекурсивное сканирование папки через `scan_local_files`.
+
+    Тест проверяет:
+    - Последовательный и параллельный обход возвращают одинаковый результат.
+    - Относительные пути используют разделитель "/", а метаданные совпадают с `os.stat`.
+    - Скрытые файлы и игнорируемые папки пропускаются.
+
+    Параметры:
+    - tmp_path: Временная папка pytest для создания дерева файлов.
+
+    Возвращает:
+    - None: Функция теста не возвращает значения, а использует `assert` для проверки результатов.
+    """
+    os.makedirs(tmp_path / "a" / "b")
+    os.makedirs(tmp_path / "__pycache__")
+    (tmp_path / "root.txt").write_text("root")
+    (tmp_path / "a" / "b" / "deep.txt").write_text("deep")
+    (tmp_path / ".hidden").write_text("hidden")
+    (tmp_path / "__pycache__" / "cache.pyc").write_text("cache")
+
+    serial = scan_local_files(str(tmp_path), max_workers=1)
+    parallel = scan_local_files(str(tmp_path), max_workers=4)
+
+    assert serial == parallel
+    assert sorted(serial) == ["a/b/deep.txt", "root.txt"]
+    st = os.stat(tmp_path / "a" / "b" / "deep.txt")
+    assert serial["a/b/deep.txt"] == LocalFileInfo(st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
@@ -0,0 +1,44 @@
+import os
+import sys
+import pytest
+from file_sync.watcher import InotifyWatcher
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify доступен только в Linux")
+def test_inotify_watcher(tmp_path) -> None:
+    """
+    Тестирует наблюдение за изменениями через inotify.
+
+    Тест проверяет, что:
+    - Несколько записей в один файл объединяются в одно изменение пути.
+    - Файлы в новой вложенной папке попадают в изменения вместе с самой папкой.
+    - Скрытые файлы игнорируются, а без событий возвращается пустое множество.
+
+    Параметры:
+    - tmp_path: Временная папка pytest для наблюдения.
+
+    Возвращает:
+    - None: Функция теста не возвращает значений, использует `assert` для проверки результатов.
+    """
+    watcher = InotifyWatcher(str(tmp_path), debounce=0.1, max_delay=1.0)
+    try:
+        for _ in range(3):
+            with open(tmp_path / "a.txt", "a") as f:
+                f.write("data")
+        (tmp_path / ".hidden").write_text("x")
+        os.makedirs(tmp_path / "sub" / "deep")
+        (tmp_path / "sub" / "deep" / "b.txt").write_text("b")
+
+        changes = set()
+        while True:
+            batch = watcher.wait_for_changes(0.5)
+            if not batch:
+                break
+            changes |= batch
+
+        assert "a.txt" in changes
+        assert "sub" in changes
+        assert os.path.join("sub", "deep", "b.txt") in changes
+        assert ".hidden" not in changes
+        assert watcher.wait_for_changes(0.1) == set()
+    finally:
+        watcher.close()
@@ -58,3 +58,64 @@ def test_upload_file(uploader: YandexDiskUploader) -> None:
 
         # Проверка вызова put для загрузки файла
         assert mock_put.call_count > 0
+
+def test_iter_files_recursive_paginated(uploader: YandexDiskUploader, requests_mock) -> None:
+    """
+    Тестирует рекурсивный постраничный листинг облачной папки.
+
+    Эмулирует корневую папку из двух страниц с вложенной папкой и проверяет, что
+    `get_info` возвращает файлы со всех страниц и из вложенной папки с относительными путями.
+
+    Параметры:
+    - uploader (YandexDiskUploader): Экземпляр загрузчика для Yandex Disk.
+    - requests_mock: Фикстура `requests-mock` для подмены HTTP-запросов.
+
+    Возвращает:
+    - None: Тест использует `assert` для проверки результата листинга.
+    """
+    from cloud_storage import yandex_disk
+
+    def listing(request, context):
+        path = request.qs["path"][0]
+        offset = int(request.qs["offset"][0])
+        if path == CLOUD_FOLDER.lower():
+            items = [{"name": f"file{offset + i}.txt", "type": "file", "size": 1, "md5": "m"} for i in range(2)]
+            if offset == 0:
+                items.append({"name": "sub", "type": "dir"})
+            return {"_embedded": {"items": items, "total": 5}}
+        return {"_embedded": {"items": [{"name": "nested.txt", "type": "file", "size": 2}], "total": 1}}
+
+    with patch.object(yandex_disk, "LISTING_PAGE_LIMIT", 3):
+        requests_mock.get("https://cloud-api.yandex.net/v1/disk/resources", json=listing)
+        files = uploader.get_info()
+
+    assert sorted(files) == ["file0.txt", "file1.txt", "file3.txt", "file4.txt", "sub/nested.txt"]
+    assert files["sub/nested.txt"].size == 2
+
+def test_prepare_directories(uploader: YandexDiskUploader, requests_mock) -> None:
+    """
+    Тестирует предварительное создание папок и кэш существующих папок.
+
+    Проверяет, что папки создаются по одному разу, включая промежуточные, папки из листинга
+    не создаются повторно, а последующая загрузка не обращается к API создания папок.
+
+    Параметры:
+    - uploader (YandexDiskUploader): Экземпляр загрузчика для Yandex Disk.
+    - requests_mock: Фикстура `requests-mock` для подмены HTTP-запросов.
+
+    Возвращает:
+    - None: Тест использует `assert` для проверки отправленных запросов.
+    """
+    requests_mock.get("https://cloud-api.yandex.net/v1/disk/resources", json={
+        "_embedded": {"items": [{"name": "a", "type": "dir"}], "total": 1}
+    })
+    uploader.get_info()
+    mkdir = requests_mock.put("https://cloud-api.yandex.net/v1/disk/resources", status_code=201)
+
+    uploader.prepare_directories(["a/b/c/one.txt", "a/b/two.txt", "a/three.txt"])
+
+    created = sorted(request.qs["path"][0] for request in mkdir.request_history)
+    assert created == [f"{CLOUD_FOLDER}/a/b".lower(), f"{CLOUD_FOLDER}/a/b/c".lower()]
+
+    uploader._create_remote_directory(f"{CLOUD_FOLDER}/a/b/c")
+    assert mkdir.call_count == 2